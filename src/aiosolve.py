@@ -0,0 +1,230 @@
+"""
+"""
+import asyncio
+import logging
+import multiprocessing
+import time
+
+from errors import *
+from run import ALGORITHMS
+from run import algorithmArgs
+
+
+class SolveJob(object):
+    """ An algorithm running in a child process, driven from asyncio.
+
+    The child reports the problem statistics through a pipe at most every
+    `interval` seconds and checks the same pipe for cancellation each
+    time the algorithm reports its progress. Awaiting the job gives the
+    algorithm result.
+
+    Attributes:
+        problem(Problem): The problem being solved (its statistics are
+            updated as the child reports them).
+        interval(float): Minimum time between progress snapshots.
+        grace(float): Time given to the child to stop on cancellation
+            before it is terminated.
+    """
+
+    def __init__(self, problem, algorithm, interval=0.1, grace=0.005,
+                 **params):
+        self.problem = problem
+        self.interval = interval
+        self.grace = grace
+
+        if problem.format not in ALGORITHMS[algorithm]["formats"]:
+            raise ProblemTypeError(problem.format)
+
+        self.func = ALGORITHMS[algorithm]["function"]
+        self.args = algorithmArgs(ALGORITHMS[algorithm], params)
+
+        self.loop = asyncio.get_running_loop()
+        self.future = self.loop.create_future()
+        self.future.add_done_callback(self._done)
+        self.snapshots = asyncio.Queue()
+
+        context = multiprocessing.get_context("fork")
+        self.conn, child = context.Pipe()
+        self.process = context.Process(
+            target=_run,
+            args=(child, problem, self.func, self.args, interval),
+            daemon=True
+        )
+        self.process.start()
+        child.close()
+
+        self.loop.add_reader(self.conn.fileno(), self._receive)
+
+    def __await__(self):
+        return self.future.__await__()
+
+    async def progress(self):
+        """ Progress snapshots until the algorithm stops.
+
+        Yields:
+            Copies of the problem statistics (dict).
+        """
+
+        while True:
+            snapshot = await self.snapshots.get()
+            if snapshot is None:
+                return
+            yield snapshot
+
+    def cancel(self):
+        """ Stop the algorithm.
+
+        Returns:
+            False if the algorithm had already stopped.
+        """
+
+        return self.future.cancel()
+
+    def _receive(self):
+        """ Handle the messages of the child process. """
+
+        try:
+            while self.conn.poll():
+                kind, value = self.conn.recv()
+                if kind == "progress":
+                    self.problem.stats.update(value)
+                    self.snapshots.put_nowait(value)
+                    continue
+
+                if self.future.done():
+                    continue
+                elif kind == "result":
+                    result, stats = value
+                    self.problem.stats.update(stats)
+                    self.future.set_result(result)
+                elif kind == "cancelled":
+                    self.future.cancel()
+                else:
+                    self.future.set_exception(RuntimeError(value))
+        except (EOFError, OSError):
+            if not self.future.done():
+                self.future.set_exception(
+                    RuntimeError("solver process died")
+                )
+            self._close()
+
+    def _done(self, future):
+        """ Stop the child process once the job is over. """
+
+        self.snapshots.put_nowait(None)
+
+        if future.cancelled() and self.process.is_alive():
+            try:
+                self.conn.send(("cancel", None))
+            except OSError:
+                pass
+            self.loop.call_later(self.grace, self._terminate)
+        else:
+            self._close()
+
+    def _terminate(self):
+        """ Kill the child process if it did not stop on its own. """
+
+        if self.process.is_alive():
+            logging.debug("Terminating solver process")
+            self.process.terminate()
+        self._close()
+
+    def _close(self):
+        """ Release the pipe and reap the child process. """
+
+        if not self.conn.closed:
+            self.loop.remove_reader(self.conn.fileno())
+            self.conn.close()
+        self._reap()
+
+    def _reap(self):
+        """ Join the child process without blocking the event loop. """
+
+        self.process.join(0)
+        if self.process.exitcode is None:
+            self.loop.call_later(self.interval, self._reap)
+
+
+class Monitor(object):
+    """ Progress monitor of the child process.
+
+    Attributes:
+        conn(Connection): Pipe to the parent process.
+        interval(float): Minimum time between progress snapshots.
+    """
+
+    def __init__(self, conn, interval):
+        self.conn = conn
+        self.interval = interval
+        self.last = 0
+
+    def __call__(self, stats):
+        if self.conn.poll():
+            raise SolverCancelled()
+
+        now = time.monotonic()
+        if now - self.last >= self.interval:
+            self.last = now
+            self.conn.send(("progress", dict(stats)))
+
+
+def _run(conn, problem, func, args, interval):
+    """ Child process entry point: run the algorithm, reporting progress.
+
+    Args:
+        conn(Connection): Pipe to the parent process.
+        problem(Problem): The problem to solve.
+        func(function): The algorithm.
+        args(Namespace): Arguments of the algorithm.
+        interval(float): Minimum time between progress snapshots.
+    """
+
+    problem.monitor = Monitor(conn, interval)
+    try:
+        conn.send(("result", (func(problem, args), dict(problem.stats))))
+    except SolverCancelled:
+        conn.send(("cancelled", None))
+    except Exception as e:
+        conn.send(("error", "{}: {}".format(type(e).__name__, e)))
+    conn.close()
+
+
+def start(problem, algorithm, **params):
+    """ Start solving a problem without waiting for the result.
+
+    Must be called from a running event loop.
+
+    Args:
+        problem(Problem): The problem to solve.
+        algorithm(str): Name of the algorithm (see run.ALGORITHMS).
+        **params: Arguments of the algorithm, plus optionally interval
+            (seconds between progress snapshots) and grace (seconds given
+            to the algorithm to stop when cancelled).
+
+    Returns:
+        job(SolveJob): The running job (awaitable).
+    """
+
+    return SolveJob(problem, algorithm, **params)
+
+
+async def solve(problem, algorithm, **params):
+    """ Solve a problem in a child process.
+
+    Cancelling the awaiting task stops the algorithm.
+
+    Args:
+        problem(Problem): The problem to solve.
+        algorithm(str): Name of the algorithm (see run.ALGORITHMS).
+        **params: Arguments of the algorithm (see start).
+
+    Returns:
+        The algorithm result: a model, False or None.
+    """
+
+    job = start(problem, algorithm, **params)
+    try:
+        return await job
+    finally:
+        job.cancel()
@@ -0,0 +1,94 @@
+#!/usr/bin/python3
+"""
+"""
+from argparse import ArgumentDefaultsHelpFormatter
+from argparse import Namespace
+import random
+
+from dimacs import Problem
+from dpll import dpll
+from run import ArgParser
+
+
+def decisions(filename, phase_flips, phase_p):
+    """ Count the decisions DPLL takes to solve a problem.
+
+    Args:
+        filename(str): DIMACS input file.
+        phase_flips(int): Flips of the initial WalkSAT run (0 skips it).
+        phase_p(float): Random walk probability of that run.
+
+    Returns:
+        A tuple with the number of decisions and the status code of the
+        result.
+    """
+
+    problem = Problem(filename)
+    result = dpll(problem, Namespace(
+        drat=None,
+        phase_flips=phase_flips,
+        phase_p=phase_p
+    ))
+    return (
+        problem.stats["decisions"],
+        Problem.status(result, problem.stats)
+    )
+
+
+def main():
+    """ Main function of the benchmark.
+
+    Compares the decisions of DPLL branching on True with those of DPLL
+    branching on the phases found by WalkSAT.
+    """
+
+    parser = ArgParser(description="", epilog="",
+                       formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        "dimacs",
+        nargs="+",
+        help="files with the satisfiability problems (in DIMACS format)"
+    )
+    parser.add_argument("-f", "--phase-flips",
+                        help="flips of the initial WalkSAT run",
+                        type=int,
+                        default=100)
+    parser.add_argument("-p", "--phase-p",
+                        help="probability of picking a symbol at random",
+                        type=float,
+                        default=0.5)
+    parser.add_argument("-s", "--seed",
+                        help="random seed of each WalkSAT run",
+                        type=int,
+                        default=0)
+
+    args = parser.parse_args()
+
+    total_default = 0
+    total_phases = 0
+
+    print("{:<40} {:>13} {:>10} {:>10} {:>10}".format(
+        "problem", "result", "default", "phases", "saved"
+    ))
+    for filename in args.dimacs:
+        default, status = decisions(filename, 0, args.phase_p)
+
+        random.seed(args.seed)
+        phases, _ = decisions(filename, args.phase_flips, args.phase_p)
+
+        total_default += default
+        total_phases += phases
+        print("{:<40} {:>13} {:>10} {:>10} {:>10}".format(
+            filename,
+            Problem.ANSWERS[status],
+            default,
+            phases,
+            default - phases
+        ))
+
+    print("{:<40} {:>13} {:>10} {:>10} {:>10}".format(
+        "total", "", total_default, total_phases, total_default - total_phases
+    ))
+
+if __name__ == '__main__':
+    main()
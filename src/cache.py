@@ -0,0 +1,173 @@
+"""
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from verify import verifyProblem
+
+
+def canonicalHash(problem):
+    """ Hash of a problem that does not depend on how it was written.
+
+    Literals inside each clause and the clauses themselves are sorted
+    (and duplicates dropped), so reordering or commenting the DIMACS file
+    gives the same hash. Clause weights are part of the hash.
+
+    Args:
+        problem(Problem): The problem to hash.
+
+    Returns:
+        Hexadecimal digest (str).
+    """
+
+    clauses = sorted({
+        (clause.weight,) + tuple(sorted({int(literal) for literal in clause}))
+        for clause in problem.expression
+    })
+
+    digest = hashlib.sha256()
+    digest.update("p {} {} {}\n".format(
+        problem.format,
+        problem.variables,
+        problem.top
+    ).encode())
+    for clause in clauses:
+        digest.update((" ".join(map(str, clause)) + " 0\n").encode())
+    return digest.hexdigest()
+
+
+class ResultCache(object):
+    """ Persistent cache of algorithm results.
+
+    Each entry is a JSON file named after the canonical hash of the
+    problem. The file modification time tracks its last use, the least
+    recently used entries being evicted when the cache grows too large.
+
+    Attributes:
+        directory(str): Where the entries are stored.
+        size(int): Maximum number of entries.
+        hits(int): Number of lookups answered by the cache.
+        misses(int): Number of lookups the cache could not answer.
+    """
+
+    SUFFIX = ".json"
+
+    def __init__(self, directory, size):
+        self.directory = directory
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, key):
+        """ Path of the entry for a given key.
+
+        Args:
+            key(str): Canonical hash of the problem.
+        """
+
+        return os.path.join(self.directory, key + ResultCache.SUFFIX)
+
+    def get(self, problem, key=None):
+        """ Look up the result of a problem.
+
+        Cached models are only trusted if they satisfy the problem.
+
+        Args:
+            problem(Problem): The problem to look up.
+            key(str): Canonical hash of the problem (computed if omitted).
+
+        Returns:
+            The cached model, False if the problem is known to be
+            unsatisfiable or None if there is no (valid) entry.
+        """
+
+        if key is None:
+            key = canonicalHash(problem)
+
+        try:
+            with open(self.path(key), 'r') as f:
+                result = json.load(f)["result"]
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+
+        if result is not False and not satisfies(problem, result):
+            logging.info("Discarding invalid cached model {}".format(key))
+            os.unlink(self.path(key))
+            self.misses += 1
+            return None
+
+        # Mark the entry as recently used
+        os.utime(self.path(key))
+        self.hits += 1
+        return result
+
+    def put(self, problem, result, key=None):
+        """ Store the result of a problem.
+
+        Only conclusive results (a model or False) are stored, the best
+        assignments found by MaxSAT may not be optimal.
+
+        Args:
+            problem(Problem): The solved problem.
+            result(list): The achieved model, False or None.
+            key(str): Canonical hash of the problem (computed if omitted).
+        """
+
+        if (
+            result is None or problem.format == "wcnf" or
+            problem.stats.get("cost")
+        ):
+            return
+
+        if key is None:
+            key = canonicalHash(problem)
+
+        # Write to a temporary file first so readers never see half an entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({"result": result}, f)
+        os.replace(tmp, self.path(key))
+
+        self.evict()
+
+    def evict(self):
+        """ Remove the least recently used entries over the size limit. """
+
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(ResultCache.SUFFIX):
+                path = os.path.join(self.directory, name)
+                try:
+                    entries.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass
+
+        entries.sort()
+        for mtime, path in entries[:max(0, len(entries) - self.size)]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def satisfies(problem, model):
+    """ Check if a model satisfies a problem.
+
+    Args:
+        problem(Problem): The problem.
+        model(list): Truth values of the symbols.
+
+    Returns:
+        Boolean.
+    """
+
+    if len(model) != problem.variables:
+        return False
+
+    return verifyProblem(problem, model) is None
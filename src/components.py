@@ -0,0 +1,205 @@
+"""
+"""
+import logging
+import multiprocessing
+
+from dimacs import Problem
+
+
+def simplify(problem):
+    """ Top level unit propagation.
+
+    Args:
+        problem(Problem): The problem to simplify.
+
+    Returns:
+        A tuple with the forced truth values (dict) and the remaining
+        clauses (lists of int literals, without the false ones)
+        or
+        None: If propagation reaches a conflict.
+    """
+
+    clauses = []
+    for clause in problem.expression:
+        literals = {int(literal) for literal in clause}
+        # tautologies are always satisfied
+        if not any(-literal in literals for literal in literals):
+            clauses.append(list(literals))
+
+    occurrences = {}
+    for i, clause in enumerate(clauses):
+        for literal in clause:
+            occurrences.setdefault(literal, []).append(i)
+
+    true = set()
+    queue = [clause[0] for clause in clauses if len(clause) == 1]
+    while queue:
+        literal = queue.pop()
+        if literal in true:
+            continue
+        if -literal in true:
+            return None
+        true.add(literal)
+
+        # clauses where the literal became false
+        for i in occurrences.get(-literal, []):
+            clause = clauses[i]
+            if any(other in true for other in clause):
+                continue
+            rest = [other for other in clause if -other not in true]
+            if not rest:
+                return None
+            if len(rest) == 1:
+                queue.append(rest[0])
+
+    assignment = {abs(literal): literal > 0 for literal in true}
+    remaining = [
+        [literal for literal in clause if -literal not in true]
+        for clause in clauses
+        if not any(literal in true for literal in clause)
+    ]
+    return (assignment, remaining)
+
+
+def components(clauses):
+    """ Connected components of the variable-clause graph.
+
+    Variables sharing a clause are joined with union-find.
+
+    Args:
+        clauses(iterable): Clauses as collections of literals (int).
+
+    Returns:
+        List of components, each one a list of clauses.
+    """
+
+    parent = {}
+
+    def find(var):
+        root = parent.setdefault(var, var)
+        while parent[root] != root:
+            parent[root] = parent[parent[root]]
+            root = parent[root]
+        return root
+
+    for clause in clauses:
+        literals = iter(clause)
+        root = find(abs(next(literals)))
+        for literal in literals:
+            other = find(abs(literal))
+            if other != root:
+                parent[other] = root
+
+    groups = {}
+    for clause in clauses:
+        groups.setdefault(find(abs(next(iter(clause)))), []).append(clause)
+    return list(groups.values())
+
+
+def subproblem(clauses):
+    """ Build a problem from a component, renumbering its variables.
+
+    Args:
+        clauses(list): Clauses of the component.
+
+    Returns:
+        A tuple with the new problem and the original variable of each of
+        its symbols.
+    """
+
+    variables = sorted({abs(literal) for clause in clauses
+                        for literal in clause})
+    index = {var: i+1 for i, var in enumerate(variables)}
+    problem = Problem.fromClauses(len(variables), [
+        [index[literal] if literal > 0 else -index[-literal]
+         for literal in clause]
+        for clause in clauses
+    ])
+    return (problem, variables)
+
+
+def _solveComponent(task):
+    """ Solve one component (pool worker).
+
+    Args:
+        task(tuple): Component index, problem, algorithm and arguments.
+
+    Returns:
+        A tuple with the component index and the algorithm result.
+    """
+
+    i, problem, func, args = task
+    return (i, func(problem, args))
+
+
+def solveComponents(problem, func, args, jobs=None, propagate=False):
+    """ Solve each independent component of a problem on its own.
+
+    Components are solved in parallel, the search stopping as soon as one
+    of them is unsatisfiable. Variables left out of every component are
+    set to False.
+
+    Args:
+        problem(Problem): The problem to solve.
+        func(function): The algorithm.
+        args: Arguments of the algorithm.
+        jobs(int): Number of worker processes (CPU count if None).
+        propagate(bool): Apply top level unit propagation first.
+
+    Returns:
+        The merged model, False or None as returned by the algorithm.
+    """
+
+    if propagate:
+        simplified = simplify(problem)
+        if simplified is None:
+            logging.info("Unit propagation reached a conflict")
+            return False
+        assignment, clauses = simplified
+    else:
+        assignment = {}
+        clauses = [
+            [int(literal) for literal in clause]
+            for clause in problem.expression
+        ]
+
+    tasks = []
+    variables = []
+    for i, component in enumerate(components(clauses)):
+        subp, subvars = subproblem(component)
+        tasks.append((i, subp, func, args))
+        variables.append(subvars)
+
+    problem.stats["components"] = len(tasks)
+    logging.info("Solving {} components".format(len(tasks)))
+
+    model = [False] * problem.variables
+    for var in assignment:
+        model[var-1] = assignment[var]
+
+    if jobs == 1 or len(tasks) < 2:
+        results = map(_solveComponent, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(jobs)
+        results = pool.imap_unordered(_solveComponent, tasks)
+
+    unknown = False
+    try:
+        for i, result in results:
+            if result is False:
+                logging.info("Component {} is unsatisfiable".format(i))
+                return False
+            if result is None:
+                unknown = True
+                continue
+            for j in range(len(result)):
+                model[variables[i][j]-1] = result[j]
+    finally:
+        if pool:
+            pool.terminate()
+            pool.join()
+
+    if unknown:
+        return None
+    return model
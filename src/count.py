@@ -0,0 +1,269 @@
+"""
+"""
+from collections import Counter
+from collections import OrderedDict
+import logging
+import sys
+
+from components import components
+
+
+class ComponentCache(object):
+    """ Bounded cache of component model counts.
+
+    Components are keyed by their clause set (hashed by Python). Least
+    recently used entries are evicted once the estimated memory of the
+    cached keys goes over budget.
+
+    Attributes:
+        budget(int): Memory budget (bytes).
+        used(int): Estimated memory taken by the entries (bytes).
+        counts(OrderedDict): Model counts, least recently used first.
+        hits(int): Number of lookups answered by the cache.
+        misses(int): Number of lookups the cache could not answer.
+    """
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.used = 0
+        self.counts = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, clauses):
+        """ Look up the model count of a component.
+
+        Args:
+            clauses(frozenset): Clauses of the component.
+
+        Returns:
+            The model count or None if it is not cached.
+        """
+
+        n = self.counts.get(clauses)
+        if n is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.counts.move_to_end(clauses)
+        return n[0]
+
+    def put(self, clauses, count):
+        """ Store the model count of a component.
+
+        Args:
+            clauses(frozenset): Clauses of the component.
+            count(int): Its model count.
+        """
+
+        if clauses in self.counts:
+            return
+
+        size = sys.getsizeof(clauses) + sum(
+            sys.getsizeof(clause) for clause in clauses
+        )
+        self.counts[clauses] = (count, size)
+        self.used += size
+
+        while self.used > self.budget and self.counts:
+            evicted, (n, evicted_size) = self.counts.popitem(last=False)
+            self.used -= evicted_size
+
+
+def count(problem, args):
+    """ Model counting (#SAT).
+
+    Exhaustive DPLL search that splits the remaining clauses into
+    independent components, counting each one on its own and caching
+    their counts.
+
+    Args:
+        problem(Problem): The problem to count.
+        args: arguments of the counting algorithm:
+            cache_mb(int): Memory budget of the component cache (MiB).
+
+    Returns:
+        A(list): A model that satisfies the problem (the number of models
+        is stored in problem.stats).
+        or
+        False(bool): If there is no possible solution.
+    """
+
+    # Extend recursion limit over to the worst case scenario
+    if (sys.getrecursionlimit() < 2 * problem.variables + 20):
+        sys.setrecursionlimit(2 * problem.variables + 20)
+
+    cache = ComponentCache(args.cache_mb * 2**20)
+
+    clauses = set()
+    for clause in problem.expression:
+        literals = frozenset(int(literal) for literal in clause)
+        # tautologies are always satisfied
+        if not any(-literal in literals for literal in literals):
+            clauses.add(literals)
+    clauses = frozenset(clauses)
+
+    # symbols that do not occur in any clause can take any value
+    free = problem.variables - len(variables(clauses))
+    models = countModels(clauses, cache) << free
+
+    problem.stats["models"] = models
+    problem.stats["component cache hits"] = cache.hits
+    problem.stats["component cache misses"] = cache.misses
+    logging.info("Number of models: {}".format(models))
+
+    if not models:
+        return False
+    return witness(problem, clauses, cache)
+
+
+def countModels(clauses, cache):
+    """ Count the models of a set of clauses.
+
+    Args:
+        clauses(frozenset): Clauses as frozensets of literals (int).
+        cache(ComponentCache): Counts of the components seen so far.
+
+    Returns:
+        Number of models over the variables of the clauses.
+    """
+
+    if not clauses:
+        return 1
+
+    parts = components(clauses)
+    if len(parts) == 1:
+        return countComponent(clauses, cache)
+
+    models = 1
+    for part in parts:
+        models *= countComponent(frozenset(part), cache)
+        if not models:
+            break
+    return models
+
+
+def countComponent(clauses, cache):
+    """ Count the models of a connected set of clauses.
+
+    Args:
+        clauses(frozenset): Clauses as frozensets of literals (int).
+        cache(ComponentCache): Counts of the components seen so far.
+
+    Returns:
+        Number of models over the variables of the clauses.
+    """
+
+    models = cache.get(clauses)
+    if models is not None:
+        return models
+
+    n = len(variables(clauses))
+    p = branchVariable(clauses)
+
+    models = 0
+    for literal in (p, -p):
+        propagated = propagate(clauses, literal)
+        if propagated is None:
+            continue
+        reduced, assigned = propagated
+
+        # symbols that disappeared without a value can take any value
+        free = n - len(assigned) - len(variables(reduced))
+        models += countModels(reduced, cache) << free
+
+    cache.put(clauses, models)
+    return models
+
+
+def witness(problem, clauses, cache):
+    """ Find one model, guided by the model counts.
+
+    Args:
+        problem(Problem): The problem.
+        clauses(frozenset): Clauses as frozensets of literals (int).
+        cache(ComponentCache): Counts of the components seen so far.
+
+    Returns:
+        A(list): A model that satisfies the problem.
+    """
+
+    A = [False] * problem.variables
+
+    while clauses:
+        p = branchVariable(clauses)
+        for literal in (p, -p):
+            propagated = propagate(clauses, literal)
+            if propagated and countModels(propagated[0], cache):
+                break
+
+        clauses, assigned = propagated
+        for literal in assigned:
+            A[abs(literal)-1] = literal > 0
+
+    return A
+
+
+def propagate(clauses, literal):
+    """ Assign a literal and propagate unit clauses.
+
+    Args:
+        clauses(frozenset): Clauses as frozensets of literals (int).
+        literal(int): Literal made true.
+
+    Returns:
+        A tuple with the remaining clauses (without the false literals)
+        and the set of true literals
+        or
+        None: If a clause became false.
+    """
+
+    true = {literal}
+
+    while True:
+        reduced = set()
+        units = []
+        for clause in clauses:
+            if not clause.isdisjoint(true):
+                continue
+            rest = frozenset(l for l in clause if -l not in true)
+            if not rest:
+                return None
+            if len(rest) == 1:
+                units.extend(rest)
+            reduced.add(rest)
+
+        if not units:
+            return (frozenset(reduced), true)
+
+        for unit in units:
+            if -unit in true:
+                return None
+            true.add(unit)
+
+
+def branchVariable(clauses):
+    """ Pick the variable occurring in the most clauses.
+
+    Args:
+        clauses(frozenset): Clauses as frozensets of literals (int).
+
+    Returns:
+        The variable (int).
+    """
+
+    occurrences = Counter(abs(l) for clause in clauses for l in clause)
+    return occurrences.most_common(1)[0][0]
+
+
+def variables(clauses):
+    """ Variables occurring in a set of clauses.
+
+    Args:
+        clauses(frozenset): Clauses as frozensets of literals (int).
+
+    Returns:
+        Set of variables (int).
+    """
+
+    return {abs(literal) for clause in clauses for literal in clause}
@@ -1,5 +1,8 @@
 """
 """
+from collections import Counter
+import sys
+
 from errors import *
 
 
@@ -8,31 +11,73 @@ class Problem(object):
 
     Attributes:
         expression(Expression): Propositional sentence to evaluate.
-        format(str): Sentence format (always CNF)
+        format(str): Sentence format (CNF or weighted CNF)
         variables(str): Number of variables
         clauses(str): Number of clauses
+        top(int): Weight of the hard clauses (weighted CNF only)
         symbols(list): List of proposition symbols (1:variables)
         filename(str): DIMACS input file.
+        stats(dict): Run statistics (written as comments of the output).
+        monitor(function): Called with the statistics as the algorithms
+            progress (may raise SolverCancelled to stop them).
     """
 
     P_TYPES = [
         "cnf",
+        "wcnf",
         # "sat"
     ]
 
-    def __init__(self, filename):
+    # Status codes of the solution line
+    STATUS = {
+        True: 1,
+        False: 0,
+        None: -1,
+    }
+
+    # Solution line of the SAT competition format (by status code)
+    ANSWERS = {
+        1: "SATISFIABLE",
+        0: "UNSATISFIABLE",
+        -1: "UNKNOWN",
+    }
+
+    def __init__(self, filename=None, text=None):
+        """ Load a problem.
+
+        Args:
+            filename(str): DIMACS input file.
+            text(str): DIMACS contents (read from filename when omitted).
+        """
+
         self.expression = Expression()
         self.format = None
         self.variables = None
         self.clauses = None
+        self.top = None
         self.symbols = None
         self.filename = filename
+        self.stats = {}
+        self.monitor = None
+
+        if text is not None:
+            self.parse(text.splitlines())
+        elif filename is not None:
+            with open(self.filename, 'r') as f:
+                self.parse(f)
 
-        f = open(self.filename, 'r')
+    def parse(self, lines):
+        """ Parse a problem in DIMACS format.
+
+        Args:
+            lines(iterable): Lines of the DIMACS input.
+        """
 
         cur_clause = Clause()
+        # weighted clauses start with their weight
+        weight = None
 
-        for line in f:
+        for line in lines:
             line = line.replace("\n", "")
             params = line.split()
 
@@ -58,10 +103,15 @@ class Problem(object):
                 (params[0].startswith("-") and params[0][1:].isdigit())
             ):
                 for var in params:
-                    if var == "0":
+                    if self.format == "wcnf" and weight is None:
+                        weight = int(var)
+                    elif var == "0":
                         if len(cur_clause):
+                            if weight is not None:
+                                cur_clause.weight = weight
                             self.expression.append(cur_clause)
                             cur_clause = Clause()
+                        weight = None
                     else:
                         cur_clause.append(
                             Literal(
@@ -71,25 +121,76 @@ class Problem(object):
                         )
 
         if len(cur_clause) > 0:
+            if weight is not None:
+                cur_clause.weight = weight
             self.expression.append(cur_clause)
 
-    def define(self, format, variables, clauses):
+    @classmethod
+    def fromClauses(cls, variables, clauses, format="cnf"):
+        """ Build a problem from a list of clauses.
+
+        Args:
+            variables(int): Number of variables.
+            clauses(list): Clauses as lists of literals (int).
+            format(str): Sentence format.
+
+        Returns:
+            problem(Problem): The new problem.
+        """
+
+        problem = cls()
+        problem.define(format, variables, len(clauses))
+        for clause in clauses:
+            problem.expression.append(Clause(
+                Literal(var, problem.symbols[abs(var)]) for var in clause
+            ))
+        return problem
+
+    def define(self, format, variables, clauses, top=None):
         """ Define the problem.
 
         Args: 
-            format(str): Sentence format (always CNF).
+            format(str): Sentence format (cnf or wcnf).
             variables(str): Number of variables.
             clauses(str): Number of clauses.
+            top(str): Weight of the hard clauses (wcnf only, all clauses
+                are soft if omitted).
         """
 
         self.format = format
         self.variables = int(variables)
         self.clauses = int(clauses)
+        if top is not None:
+            self.top = int(top)
 
         self.symbols = {
             i: Symbol(i) for i in range(1, self.variables + 1)
         }
 
+    def report(self):
+        """ Report the progress of an algorithm to the monitor (if any).
+        """
+
+        if self.monitor:
+            self.monitor(self.stats)
+
+    def isHard(self, clause):
+        """ Check if a clause must be satisfied.
+
+        Every clause of a CNF problem is hard, weighted clauses are hard
+        when their weight reaches top.
+
+        Args:
+            clause(Clause): The clause.
+
+        Returns:
+            Boolean.
+        """
+
+        if self.format != "wcnf":
+            return True
+        return self.top is not None and clause.weight >= self.top
+
     def set(self, values):
         """ Set the values of the symbols.
 
@@ -131,65 +232,198 @@ class Problem(object):
 
         return len(self.expression) != self.clauses
 
-    def writeOutput(self, alg, result):
+    @staticmethod
+    def status(result, stats=None):
+        """ Status code of an algorithm result.
+
+        MaxSAT results are the best assignments found: only a zero cost
+        is known to be optimal, anything else is unknown.
+
+        Args:
+            result(list): The achieved model, False or None.
+            stats(dict): Run statistics (holding the MaxSAT cost, if any).
+
+        Returns:
+            1 if satisfiable, 0 if unsatisfiable, -1 if unknown.
+        """
+
+        if result is None or result is False:
+            return Problem.STATUS[result]
+        if stats and stats.get("cost"):
+            return Problem.STATUS[None]
+        return Problem.STATUS[True]
+
+    def writeOutput(self, alg, result, path=None, competition=False):
         """ Write output file
 
         Args:
             alg(str): Name of the used SAT solving algorithm
             result(list): List with the achieved model (solution).
+            path(str): Output file ('-' for stdout). Defaults to the input
+                file with .out extension.
+            competition(bool): Use the SAT competition solution line.
         """
 
-        dict_solution = {
-            True: 1,
-            False: 0,
-            None: -1,
-        }
-
-        # output file will be named equal to the input file with
-        # .out extension
-        out = open(self.filename[:self.filename.rfind('.')]+".out", 'w')
+        chunks = []
 
         # Comments
-        out.write(
+        chunks.append(
             'c\n' +
-            'c Used algorithm: ' + alg + '\n' +
-            'c\n'
+            'c Used algorithm: ' + alg + '\n'
         )
+        for name, value in self.stats.items():
+            chunks.append('c ' + name + ': ' + str(value) + '\n')
+        chunks.append('c\n')
+
+        optimizing = "cost" in self.stats
+        status = Problem.status(result, self.stats)
 
         if result is False:
-            out.write('c ' + 'Unsatisfiable Problem' + '\n')
+            chunks.append('c ' + 'Unsatisfiable Problem' + '\n')
         elif result is None:
-            out.write('c ' + 'No solution was found' + '\n')
+            chunks.append('c ' + 'No solution was found' + '\n')
+        elif optimizing:
+            chunks.append(
+                'c ' + 'Best assignment found' + ' (cost ' +
+                str(self.stats["cost"]) + ')\n'
+            )
         else:
-            out.write('c ' + 'Satisfiable Problem' + '\n')
+            chunks.append('c ' + 'Satisfiable Problem' + '\n')
+
+        # Cost Line
+        if optimizing and result:
+            chunks.append('o ' + str(self.stats["cost"]) + '\n')
 
         # Solution Line
-        if result:
-            k = True
+        if competition:
+            # a plain CNF model of cost 0 simply satisfies the problem
+            if (
+                self.format == "wcnf" and optimizing and result and
+                not self.stats["cost"]
+            ):
+                answer = "OPTIMUM FOUND"
+            else:
+                answer = Problem.ANSWERS[status]
+            chunks.append('s ' + answer + '\n')
         else:
-            k = result
-        out.write('s ' + self.format + ' ' + str(dict_solution[k]))
-        out.write(' ' + str(self.variables) +
-        ' ' + str(self.clauses) + '\n')
+            chunks.append(
+                's ' + self.format + ' ' + str(status) +
+                ' ' + str(self.variables) + ' ' + str(self.clauses) + '\n'
+            )
 
-        # Variable Line        
+        # Variable Lines
         if result:
-            out.write('v ')
-            for i in range(0, len(result)):
-                if result[i] is True:
-                    out.write(str(i+1) + ' ')
-                elif result[i] is False:
-                    out.write('-' + str(i+1) + ' ')
+            chunks.extend(Problem.valueLines(result))
 
+        if path is None:
+            # output file will be named equal to the input file with
+            # .out extension
+            path = self.filename[:self.filename.rfind('.')]+".out"
 
-    def __str__(self):
-        ret = ""
+        if path == '-':
+            sys.stdout.write(''.join(chunks))
+            sys.stdout.flush()
+        else:
+            with open(path, 'w') as out:
+                out.write(''.join(chunks))
+
+    @staticmethod
+    def valueLines(result, width=78):
+        """ Variable lines of a model.
+
+        Literals are wrapped over 'v' lines and terminated by 0.
+
+        Args:
+            result(list): The achieved model (None values are skipped).
+            width(int): Maximum line length.
+
+        Returns:
+            List of lines (str).
+        """
+
+        literals = [
+            str(i+1) if result[i] else '-' + str(i+1)
+            for i in range(len(result))
+            if result[i] is not None
+        ]
+        literals.append('0')
+
+        lines = []
+        start = 0
+        length = 1
+        for i in range(len(literals)):
+            if length + 1 + len(literals[i]) > width and i > start:
+                lines.append('v ' + ' '.join(literals[start:i]) + '\n')
+                start = i
+                length = 1
+            length += 1 + len(literals[i])
+        lines.append('v ' + ' '.join(literals[start:]) + '\n')
+        return lines
+
+    def render(self, limit=None):
+        """ Render the problem clause by clause.
+
+        Args:
+            limit(int): Maximum number of clauses to render (all if None).
+
+        Yields:
+            Rendered clauses (str), joined by the conjunction symbol.
+        """
+
+        for i, clause in enumerate(self.expression):
+            if limit is not None and i >= limit:
+                yield "∧…"
+                return
+            yield ("∧" if i else "") + str(clause)
+
+    def dimacs(self, limit=None):
+        """ Render the problem in DIMACS format line by line.
+
+        Args:
+            limit(int): Maximum number of clauses to render (all if None).
+
+        Yields:
+            DIMACS lines (str).
+        """
+
+        # the clause count must match the clauses actually rendered
+        clauses = self.clauses
+        if limit is not None:
+            clauses = min(limit, len(self.expression))
+
+        header = [self.format, self.variables, clauses]
+        # weighted clauses start with their weight
+        weighted = self.format == "wcnf"
+        if weighted and self.top is not None:
+            header.append(self.top)
+        yield "p " + " ".join(map(str, header)) + "\n"
+
+        for i, clause in enumerate(self.expression):
+            if limit is not None and i >= limit:
+                return
+            yield " ".join(
+                ([str(clause.weight)] if weighted else []) +
+                [str(int(literal)) for literal in clause] + ["0\n"]
+            )
+
+    def summary(self):
+        """ Summary statistics of the problem.
+
+        Returns:
+            A tuple with the clause length histogram and the number of
+            occurrences of each symbol (both Counter).
+        """
+
+        lengths = Counter()
+        occurrences = Counter()
         for clause in self.expression:
-            if ret:
-                ret += "∧"
+            lengths[len(clause)] += 1
+            for literal in clause:
+                occurrences[literal.symbol.number] += 1
+        return (lengths, occurrences)
 
-            ret += str(clause)
-        return ret
+    def __str__(self):
+        return "".join(self.render())
 
     def __bool__(self):
         if self.expression:
@@ -237,9 +471,11 @@ class Clause(list):
     Disjunction of literals.
 
     Attributes:
-        None
+        weight(int): Cost of falsifying the clause (weighted CNF only).
     """
 
+    weight = 1
+
     def __bool__(self):
         n = False
         for literal in self:
@@ -254,12 +490,7 @@ class Clause(list):
         return False
 
     def __str__(self):
-        c = ""
-        for var in self:
-            if c:
-                c += "∨"
-            c += str(var)
-        return "({})".format(c)
+        return "({})".format("∨".join([str(var) for var in self]))
 
 
 class Literal(object):
@@ -277,6 +508,9 @@ class Literal(object):
         self.symbol = symbol
         self.negation = value < 0
 
+    def __int__(self):
+        return -self.symbol.number if self.negation else self.symbol.number
+
     def __bool__(self):
         if self.symbol.truth is None:
             raise UndefinedError
@@ -3,17 +3,23 @@
 import logging
 import random
 import sys
+from drat import DratWriter
 from errors import *
+from walksat import search
 
 
 def dpll(problem, args):
     """ DPLL algorithm.
 
-    Initializes an empty model and starts recursing.
+    Initializes an empty model and starts recursing. Optionally, a short
+    WalkSAT run first picks the value each symbol is branched on first.
 
     Args:
         problem(Problem): The problem to solve.
-        args: arguments of the DPLL algorithm (None)
+        args: arguments of the DPLL algorithm:
+            drat(str): File where the DRAT proof is written (optional).
+            phase_flips(int): Flips of the initial WalkSAT run (0 skips it).
+            phase_p(float): Random walk probability of that run.
 
     Returns:
         standard_model(list): The achieved model that satisfies the problem.
@@ -25,8 +31,29 @@ def dpll(problem, args):
     if (sys.getrecursionlimit() < len(problem.symbols) + 20):
         sys.setrecursionlimit(len(problem.symbols) + 20)
 
+    problem.stats["decisions"] = 0
+    problem.stats["conflicts"] = 0
+
+    # Branch first on the best assignment found by local search
+    phases = None
+    if args.phase_flips:
+        phases, falsified = search(problem, args.phase_p, args.phase_flips)
+        logging.info("Initial phases falsify {} clauses".format(falsified))
+        if not falsified:
+            return phases
+
+    proof = None
+    if args.drat:
+        proof = DratWriter(args.drat)
+
     model = {}
-    if not dpllRecurse(problem, model):
+    try:
+        satisfiable = dpllRecurse(problem, model, proof, phases=phases)
+    finally:
+        if proof:
+            proof.close()
+
+    if not satisfiable:
         return False
     standard_model = []
     for i in range(1, len(problem.symbols)+1):
@@ -37,17 +64,26 @@ def dpll(problem, args):
     return standard_model
 
 
-def dpllRecurse(problem, model={}):
+def dpllRecurse(problem, model={}, proof=None, decisions=[], phases=None):
     """ Recursive DPLL
 
+    When a proof is given, a failing call adds the negation of its
+    decisions as a lemma (the empty clause at the top level). Pure symbols
+    are added as RAT lemmas, everything else follows by unit propagation.
+
     Args:
         problem(Problem): The problem to solve.
         model(dict): Empty model.
+        proof(DratWriter): Where the UNSAT proof is written (optional).
+        decisions(list): Branching literals leading to this call.
+        phases(list): Value tried first for each symbol (True if None).
 
     Returns:
         True(bool): If a solution was found.
         False(bool): If there is no possible solution
     """
+    problem.report()
+
     values = []
     for i in range(1, len(problem.symbols)+1):
         if i in model:
@@ -64,6 +100,9 @@ def dpllRecurse(problem, model={}):
 
         # if any clause is False
         else:
+            problem.stats["conflicts"] += 1
+            if proof:
+                proof.add([-d for d in decisions])
             return False
 
     except UndefinedError:
@@ -75,10 +114,17 @@ def dpllRecurse(problem, model={}):
         #logging.debug("pure symbol found! {}:{}".format(p, value))
         model[p] = value
 
-        ret = dpllRecurse(problem, model)
+        # the pure literal goes first, it is the RAT pivot
+        lemma = [p if value else -p] + [-d for d in decisions]
+        if proof:
+            proof.add(lemma)
+
+        ret = dpllRecurse(problem, model, proof, decisions, phases)
         if not ret:
             # remove assumption from model if it did not work
             del model[p]
+            if proof:
+                proof.delete(lemma)
         return ret
 
     # check if there is any unit clause
@@ -87,7 +133,7 @@ def dpllRecurse(problem, model={}):
         #logging.debug("unit symbol! {}:{}".format(p, value))
         model[p] = value
 
-        ret = dpllRecurse(problem, model)
+        ret = dpllRecurse(problem, model, proof, decisions, phases)
         if not ret:
             # remove assumption from model if it did not work
             del model[p]
@@ -98,18 +144,25 @@ def dpllRecurse(problem, model={}):
         if p not in model:
             break
 
-    #logging.debug("trying a value for {}:{}".format(p, True))
-    model[p] = True
-    if dpllRecurse(problem, model):
-        return True
-
-    #logging.debug("trying a value for {}:{}".format(p, False))
-    model[p] = False
-    if dpllRecurse(problem, model):
-        return True
+    # try the preferred value first
+    first = True if phases is None else phases[p-1]
+    for value in (first, not first):
+        #logging.debug("trying a value for {}:{}".format(p, value))
+        problem.stats["decisions"] += 1
+        model[p] = value
+        literal = p if value else -p
+        if dpllRecurse(problem, model, proof, decisions + [literal], phases):
+            return True
 
     # remove assumption from model
     del(model[p])
+
+    # both branches failed: replace their lemmas by the common one
+    if proof:
+        lemma = [-d for d in decisions]
+        proof.add(lemma)
+        proof.delete(lemma + [-p])
+        proof.delete(lemma + [p])
     return False
 
 
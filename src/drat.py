@@ -0,0 +1,65 @@
+"""
+"""
+
+
+class DratWriter(object):
+    """ Writes a proof in binary DRAT format.
+
+    Every lemma is a clause that is either added ('a') or deleted ('d').
+    Literals are mapped to 2*variable (+1 if negated) and written as
+    variable length integers, 7 bits per byte, least significant first.
+
+    Attributes:
+        file(file): Binary proof file.
+    """
+
+    ADD = b'a'
+    DELETE = b'd'
+
+    def __init__(self, filename):
+        self.file = open(filename, 'wb', buffering=1 << 20)
+
+    def add(self, literals):
+        """ Add a lemma to the proof.
+
+        Args:
+            literals(list): Literals of the clause (int).
+        """
+
+        self.file.write(DratWriter.encode(DratWriter.ADD, literals))
+
+    def delete(self, literals):
+        """ Delete a lemma from the proof.
+
+        Args:
+            literals(list): Literals of the clause (int).
+        """
+
+        self.file.write(DratWriter.encode(DratWriter.DELETE, literals))
+
+    def close(self):
+        """ Flush and close the proof file. """
+
+        self.file.close()
+
+    @staticmethod
+    def encode(mark, literals):
+        """ Encode a proof line.
+
+        Args:
+            mark(bytes): Add or delete mark.
+            literals(list): Literals of the clause (int).
+
+        Returns:
+            bytearray
+        """
+
+        data = bytearray(mark)
+        for literal in literals:
+            n = 2 * abs(literal) + (literal < 0)
+            while n > 127:
+                data.append(n & 127 | 128)
+                n >>= 7
+            data.append(n)
+        data.append(0)
+        return data
@@ -33,3 +33,14 @@ class UndefinedError(Exception):
 
     def __str__(self):
         return repr("Not enough information to evaluate!")
+
+
+class SolverCancelled(Exception):
+    """
+    """
+
+    def __init__(self):
+        pass
+
+    def __str__(self):
+        return repr("The solver was cancelled!")
@@ -21,17 +21,28 @@ def gsat(problem, args):
     max_restarts = args.max_restarts
     max_climbs = args.max_climbs
 
+    problem.stats["restarts"] = 0
+    problem.stats["climbs"] = 0
+    problem.stats["best score"] = 0
+
     # Try to solve the problem with a random truth assignment max_restarts
     #times
     for i in range(max_restarts):
+        problem.stats["restarts"] = i + 1
         # Random truth assignment to all the symbols in the problem
         A = [bool(random.getrandbits(1)) for x in range(problem.variables)]
         for j in range(max_climbs):
             problem.set(A)
             # Stop if A is the solution
             if problem.expression:
+                problem.stats["best score"] = len(problem.expression)
                 return A
-            A = choose_successor(problem, A)
+            A, score = choose_successor(problem, A)
+
+            problem.stats["climbs"] += 1
+            if score > problem.stats["best score"]:
+                problem.stats["best score"] = score
+            problem.report()
 
     return None
 
@@ -45,7 +56,7 @@ def choose_successor(problem, A):
         A(list): The model achieved so far.
 
     Returns:
-        A(list): The new and improved model.
+        A tuple with the new and improved model and its score.
     """
 
     best_score = 0
@@ -66,4 +77,4 @@ def choose_successor(problem, A):
 
     chosen = random.choice(best_solutions)
     A[chosen] = not A[chosen]
-    return A
+    return (A, best_score)
@@ -0,0 +1,243 @@
+"""
+"""
+import random
+import time
+
+
+def maxsat(problem, args):
+    """ Weighted MaxSAT local search.
+
+    WalkSAT style search minimizing the weight of the falsified clauses
+    (their number for CNF problems).
+    Make/break scores are kept up to date on every flip and the dynamic
+    weight of the falsified clauses is increased on local optima, so the
+    search is pushed away from them. The best assignment found is kept
+    all along.
+
+    Args:
+        problem(Problem): The problem to solve.
+        args: arguments of the MaxSAT algorithm:
+            p(float): Probability of a random walk on local optima
+            max_flips(int): Maximum number of flips
+            max_seconds(float): Time limit (optional)
+
+    Returns:
+        A(list): The assignment with the lowest cost found that satisfies
+        every hard clause (its cost is stored in problem.stats, it may not
+        be optimal).
+        or
+        None: If no such assignment was found.
+    """
+
+    n = problem.variables
+
+    # Clauses as lists of literals, tautologies are always satisfied
+    clauses = []
+    weights = []
+    hard = []
+    for clause in problem.expression:
+        literals = list({int(literal) for literal in clause})
+        if any(-literal in literals for literal in literals):
+            continue
+        clauses.append(literals)
+        weights.append(clause.weight)
+        # plain CNF clauses are all soft with weight 1
+        hard.append(problem.format == "wcnf" and problem.isHard(clause))
+
+    soft_weights = [weights[c] for c in range(len(clauses)) if not hard[c]]
+    hard_weight = max(soft_weights, default=0) + 1
+
+    # Dynamic weights guiding the search
+    dynamic = [hard_weight if hard[c] else weights[c]
+               for c in range(len(clauses))]
+
+    occurrences = {}
+    for c, clause in enumerate(clauses):
+        for literal in clause:
+            occurrences.setdefault(literal, []).append(c)
+
+    # Random truth assignment to all the symbols in the problem
+    A = [None] + [bool(random.getrandbits(1)) for x in range(n)]
+
+    search = Search(clauses, weights, hard, dynamic, occurrences, A)
+
+    deadline = None
+    if args.max_seconds:
+        deadline = time.perf_counter() + args.max_seconds
+
+    best = None
+    best_cost = (float("inf"), float("inf"))
+    flips = 0
+
+    while True:
+        cost = (search.hard_falsified, search.soft_cost)
+        if cost < best_cost:
+            best_cost = cost
+            best = A[1:]
+            if not search.unsat:
+                break
+
+        if flips >= args.max_flips:
+            break
+        if flips % 256 == 0:
+            if deadline and time.perf_counter() > deadline:
+                break
+            problem.stats["flips"] = flips
+            problem.stats["cost"] = best_cost[1]
+            problem.stats["hard clauses falsified"] = best_cost[0]
+            problem.report()
+
+        # From the falsified clauses pick one at random
+        clause = clauses[random.choice(search.unsat)]
+
+        # find the best symbol to flip in that clause
+        best_score = None
+        best_flips = []
+        for literal in clause:
+            score = search.score[abs(literal)]
+            if best_score is None or score > best_score:
+                best_score = score
+                best_flips = [abs(literal)]
+            elif score == best_score:
+                best_flips.append(abs(literal))
+
+        var = random.choice(best_flips)
+
+        # local optimum: reweight and maybe walk at random
+        if best_score <= 0:
+            search.reweight()
+            if random.random() < args.p:
+                var = abs(random.choice(clause))
+
+        search.flip(var)
+        flips += 1
+
+    problem.stats["flips"] = flips
+    problem.stats["cost"] = best_cost[1]
+    problem.stats["hard clauses falsified"] = best_cost[0]
+
+    if best_cost[0]:
+        return None
+    return best
+
+
+class Search(object):
+    """ State of the local search.
+
+    Attributes:
+        clauses(list): Clauses as lists of literals (int).
+        weights(list): Weight of each clause.
+        hard(list): Whether each clause is hard.
+        dynamic(list): Dynamic weight of each clause.
+        occurrences(dict): Clauses in which each literal occurs.
+        A(list): Truth assignment (indexed by symbol, from 1).
+        true_count(list): Number of true literals of each clause.
+        critical(list): Symbol of the only true literal of each clause.
+        unsat(list): Falsified clauses.
+        score(list): Change in dynamic weight of the satisfied clauses
+            when flipping each symbol (make - break).
+        hard_falsified(int): Number of falsified hard clauses.
+        soft_cost(int): Weight of the falsified soft clauses.
+    """
+
+    def __init__(self, clauses, weights, hard, dynamic, occurrences, A):
+        self.clauses = clauses
+        self.weights = weights
+        self.hard = hard
+        self.dynamic = dynamic
+        self.occurrences = occurrences
+        self.A = A
+
+        self.true_count = [0] * len(clauses)
+        self.critical = [0] * len(clauses)
+        self.unsat = []
+        self.position = [None] * len(clauses)
+        self.score = [0] * len(A)
+        self.hard_falsified = 0
+        self.soft_cost = 0
+
+        for c, clause in enumerate(clauses):
+            true = [literal for literal in clause
+                     if A[abs(literal)] == (literal > 0)]
+            self.true_count[c] = len(true)
+            if not true:
+                self.falsify(c)
+                for literal in clause:
+                    self.score[abs(literal)] += dynamic[c]
+            elif len(true) == 1:
+                self.critical[c] = abs(true[0])
+                self.score[abs(true[0])] -= dynamic[c]
+
+    def falsify(self, c):
+        """ Add a clause to the falsified ones. """
+
+        self.position[c] = len(self.unsat)
+        self.unsat.append(c)
+        if self.hard[c]:
+            self.hard_falsified += 1
+        else:
+            self.soft_cost += self.weights[c]
+
+    def satisfy(self, c):
+        """ Remove a clause from the falsified ones. """
+
+        last = self.unsat.pop()
+        if last != c:
+            self.unsat[self.position[c]] = last
+            self.position[last] = self.position[c]
+        self.position[c] = None
+        if self.hard[c]:
+            self.hard_falsified -= 1
+        else:
+            self.soft_cost -= self.weights[c]
+
+    def flip(self, var):
+        """ Flip a symbol, updating the scores of its neighbours.
+
+        Args:
+            var(int): The symbol.
+        """
+
+        A = self.A
+        score = self.score
+        dynamic = self.dynamic
+        old_score = score[var]
+
+        A[var] = not A[var]
+        literal = var if A[var] else -var
+
+        # clauses where the symbol became true
+        for c in self.occurrences.get(literal, []):
+            self.true_count[c] += 1
+            if self.true_count[c] == 1:
+                self.satisfy(c)
+                self.critical[c] = var
+                for other in self.clauses[c]:
+                    score[abs(other)] -= dynamic[c]
+            elif self.true_count[c] == 2:
+                score[self.critical[c]] += dynamic[c]
+
+        # clauses where the symbol became false
+        for c in self.occurrences.get(-literal, []):
+            self.true_count[c] -= 1
+            if self.true_count[c] == 0:
+                self.falsify(c)
+                for other in self.clauses[c]:
+                    score[abs(other)] += dynamic[c]
+            elif self.true_count[c] == 1:
+                for other in self.clauses[c]:
+                    if A[abs(other)] == (other > 0):
+                        self.critical[c] = abs(other)
+                        score[abs(other)] -= dynamic[c]
+                        break
+
+        # flipping back would undo everything
+        score[var] = -old_score
+
+    def reweight(self):
+        """ Increase the dynamic weight of the falsified clauses. """
+
+        for c in self.unsat:
+            self.dynamic[c] += 1
+            for literal in self.clauses[c]:
+                self.score[abs(literal)] += 1
@@ -2,13 +2,20 @@
 
 from argparse import ArgumentParser
 from argparse import ArgumentDefaultsHelpFormatter
+from argparse import Namespace
 import logging
 import sys
 
+from cache import ResultCache
+from cache import canonicalHash
+from components import solveComponents
 from dimacs import *
+from verify import verifyFile
 from gsat import gsat
 from walksat import walksat
 from dpll import dpll
+from maxsat import maxsat
+from count import count
 
 
 # Dictionary for the implemented algorithms
@@ -16,6 +23,7 @@ ALGORITHMS = {
     "gsat": {
         "function": gsat,
         "help": "GSAT algorithm",
+        "formats": ["cnf"],
         "args": [
             {
                 "name": "max_restarts",
@@ -31,6 +39,7 @@ ALGORITHMS = {
     }, "walksat": {
         "function": walksat,
         "help": "WalkSAT algorithm",
+        "formats": ["cnf"],
         "args": [
             {
                 "name": "p",
@@ -46,7 +55,63 @@ ALGORITHMS = {
     }, "dpll": {
         "function": dpll,
         "help": "DPLL algorithm",
+        "formats": ["cnf"],
         "args": [
+            {
+                "name": "--drat",
+                "type": str,
+                "default": None,
+                "help": "File where the binary DRAT proof of \
+                    unsatisfiability is written"
+            },
+            {
+                "name": "--phase-flips",
+                "type": int,
+                "default": 0,
+                "help": "Flips of a WalkSAT run picking the value each \
+                    symbol is branched on first (0 to branch on True)"
+            },
+            {
+                "name": "--phase-p",
+                "type": float,
+                "default": 0.5,
+                "help": "Probability of picking a symbol at random in that \
+                    WalkSAT run"
+            }
+        ]
+    }, "maxsat": {
+        "function": maxsat,
+        "help": "Weighted MaxSAT local search",
+        "formats": ["cnf", "wcnf"],
+        "args": [
+            {
+                "name": "p",
+                "type": float,
+                "help": "Probability of a random walk on local optima"
+            },
+            {
+                "name": "max_flips",
+                "type": int,
+                "help": "Maximum number of symbols to flip"
+            },
+            {
+                "name": "--max-seconds",
+                "type": float,
+                "default": None,
+                "help": "Time limit (seconds)"
+            }
+        ]
+    }, "count": {
+        "function": count,
+        "help": "Model counting (#SAT)",
+        "formats": ["cnf"],
+        "args": [
+            {
+                "name": "--cache-mb",
+                "type": int,
+                "default": 256,
+                "help": "Memory budget of the component cache (MiB)"
+            }
         ]
     }
 }
@@ -67,6 +132,60 @@ class ArgParser(ArgumentParser):
         sys.exit(2)
 
 
+def algorithmArgs(algorithm, params):
+    """ Build the arguments of an algorithm outside the command line.
+
+    Args:
+        algorithm(dict): Algorithm definition (see ALGORITHMS).
+        params(dict): Values of the arguments (optional ones may be left
+            out).
+
+    Returns:
+        args(Namespace): Arguments of the algorithm.
+    """
+
+    args = Namespace()
+    for var in algorithm["args"]:
+        name = var["name"].lstrip("-").replace("-", "_")
+        if name in params:
+            setattr(args, name, var["type"](params[name]))
+        elif var["name"].startswith("-"):
+            setattr(args, name, var.get("default"))
+        else:
+            raise KeyError(name)
+    return args
+
+
+def printProblem(problem, mode, limit=None):
+    """ Print the problem to stdout as it is rendered.
+
+    Args:
+        problem(Problem): The problem to print.
+        mode(str): pretty, dimacs or summary.
+        limit(int): Maximum number of clauses (or symbols in summary mode).
+    """
+
+    if mode == "pretty":
+        sys.stdout.writelines(problem.render(limit))
+        sys.stdout.write("\n")
+
+    elif mode == "dimacs":
+        sys.stdout.writelines(problem.dimacs(limit))
+
+    else:
+        lengths, occurrences = problem.summary()
+        print("variables: {}".format(problem.variables))
+        print("clauses: {}".format(len(problem.expression)))
+        print("clause lengths:")
+        for length in sorted(lengths):
+            print("  {}: {}".format(length, lengths[length]))
+        print("most frequent symbols:")
+        for symbol, count in occurrences.most_common(
+            10 if limit is None else limit
+        ):
+            print("  {}: {}".format(symbol, count))
+
+
 def main():
     """ Main function of the program.
 
@@ -94,6 +213,7 @@ def main():
             subparser.add_argument(
                 var["name"],
                 type=var["type"],
+                default=var.get("default"),
                 help=var["help"]
             )
         subparser.set_defaults(func=ALGORITHMS[algorithm]["function"])
@@ -101,6 +221,14 @@ def main():
     parser.add_argument("-pp", "--print-problem",
                         action="store_true",
                         help="Print the problem")
+    parser.add_argument("-pm", "--print-mode",
+                        help="how the problem is printed",
+                        choices=["pretty", "dimacs", "summary"],
+                        default="pretty")
+    parser.add_argument("-pl", "--print-limit",
+                        help="maximum number of clauses (or most frequent \
+                            symbols in summary mode) to print",
+                        type=int)
     parser.add_argument("-ps", "--print-solution",
                         action="store_true",
                         help="Print solution to stdout")
@@ -117,10 +245,56 @@ def main():
     parser.add_argument("-ns", "--no-sol",
                         help="do not write solution file (to measure \
                         algorithm performance)",
-                        action="store_false")
+                        action="store_true")
+    parser.add_argument("-o", "--output",
+                        help="solution file ('-' for stdout, defaults to \
+                            the input file with .out extension)")
+    parser.add_argument("-sc", "--sat-competition",
+                        help="write the solution line in SAT competition \
+                            format",
+                        action="store_true")
+    parser.add_argument("-d", "--decompose",
+                        help="solve each independent component of the \
+                            problem on its own",
+                        action="store_true")
+    parser.add_argument("-up", "--unit-propagate",
+                        help="apply top level unit propagation before \
+                            decomposing",
+                        action="store_true")
+    parser.add_argument("-j", "--jobs",
+                        help="number of components solved in parallel \
+                            (defaults to the number of CPUs)",
+                        type=int)
+    parser.add_argument("-V", "--verify",
+                        help="check that the model satisfies the problem",
+                        action="store_true")
+    parser.add_argument("-c", "--cache",
+                        help="directory of the result cache (disabled if \
+                            omitted)")
+    parser.add_argument("-cs", "--cache-size",
+                        help="maximum number of cached results",
+                        type=int,
+                        default=1000)
 
     args = parser.parse_args()
 
+    if args.decompose and getattr(args, "drat", None):
+        parser.error("DRAT proofs are not supported with --decompose")
+
+    # the model count is only known to the counting run itself
+    if args.algorithm == "count" and (args.decompose or args.cache):
+        parser.error(
+            "model counting is not supported with --decompose or --cache"
+        )
+
+    # component costs (and weights) would be lost when merging models
+    if args.algorithm == "maxsat" and args.decompose:
+        parser.error("MaxSAT is not supported with --decompose")
+
+    # a cached result would skip the solver and leave no proof
+    if args.cache and getattr(args, "drat", None):
+        parser.error("DRAT proofs are not supported with --cache")
+
     logging.basicConfig(format='%(asctime)s %(message)s',
                         datefmt='%Y/%m/%d %H:%M:%S',
                         filename=args.logfile,
@@ -133,15 +307,64 @@ def main():
     p = Problem(args.dimacs)
     logging.debug("Done parsing file")
 
+    if p.format not in ALGORITHMS[args.algorithm]["formats"]:
+        parser.error("{} problems are not supported by {}".format(
+            p.format,
+            args.algorithm
+        ))
+
     if args.print_problem:
         logging.debug("Printing problem")
-        print(p)
+        printProblem(p, args.print_mode, args.print_limit)
         logging.debug("Done printing problem")
 
+    # Looks for a previous result of the same problem
+    result = None
+    if args.cache:
+        cache = ResultCache(args.cache, args.cache_size)
+        key = canonicalHash(p)
+        result = cache.get(p, key)
+
     # Applies an algorithm to solve the SAT problem
-    logging.debug("Solving problem")
-    result = args.func(p, args)
-    logging.debug("Problem solved")
+    if result is None:
+        logging.debug("Solving problem")
+        if args.decompose:
+            result = solveComponents(
+                p,
+                args.func,
+                args,
+                args.jobs,
+                args.unit_propagate
+            )
+        else:
+            result = args.func(p, args)
+        logging.debug("Problem solved")
+        if args.cache:
+            cache.put(p, result, key)
+    else:
+        logging.debug("Result found in cache")
+
+    if args.cache:
+        p.stats["cache hits"] = cache.hits
+        p.stats["cache misses"] = cache.misses
+        logging.info("Cache hits: {}, misses: {}".format(
+            cache.hits,
+            cache.misses
+        ))
+
+    # Checks the model against the input file
+    verified = True
+    # (soft clauses of plain CNF problems may be falsified by MaxSAT)
+    if args.verify and result and not (
+        p.format == "cnf" and p.stats.get("cost")
+    ):
+        logging.debug("Verifying model")
+        falsified = verifyFile(args.dimacs, result)
+        verified = falsified is None
+        p.stats["model verified"] = verified
+        if not verified:
+            logging.error("Model falsifies clause {}".format(falsified + 1))
+        logging.debug("Done verifying model")
 
     if args.print_solution:
         if result is None:
@@ -153,9 +376,18 @@ def main():
             print("Problem not satisfiable!")
 
     # Writes the output file (DIMACS format)
-    logging.debug("Writing output file")
-    p.writeOutput(args.algorithm, result)
-    logging.debug("Output file written")
+    if not args.no_sol:
+        logging.debug("Writing output file")
+        p.writeOutput(
+            args.algorithm,
+            result,
+            args.output,
+            args.sat_competition
+        )
+        logging.debug("Output file written")
+
+    if not verified:
+        sys.exit(1)
 
 if __name__ == '__main__':
     main()
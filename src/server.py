@@ -0,0 +1,338 @@
+#!/usr/bin/python3
+"""
+"""
+from argparse import ArgumentDefaultsHelpFormatter
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import socketserver
+import sys
+import threading
+
+from dimacs import Problem
+from errors import *
+from run import ALGORITHMS
+from run import ArgParser
+from run import algorithmArgs
+
+
+class ProblemCache(object):
+    """ LRU cache of parsed problems.
+
+    Problems are keyed by the hash of their DIMACS contents, so the same
+    formula is only parsed once no matter where it came from.
+
+    Attributes:
+        size(int): Maximum number of problems kept.
+        problems(OrderedDict): Parsed problems, least recently used first.
+        hits(int): Number of lookups served from the cache.
+        misses(int): Number of lookups that had to parse the problem.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.problems = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, text, filename=None):
+        """ Get the parsed problem for some DIMACS contents.
+
+        Args:
+            text(str): DIMACS contents.
+            filename(str): File the contents were read from (if any).
+
+        Returns:
+            problem(Problem): The parsed problem.
+        """
+
+        key = hashlib.sha256(text.encode()).hexdigest()
+
+        with self.lock:
+            if key in self.problems:
+                self.hits += 1
+                self.problems.move_to_end(key)
+                return self.problems[key]
+
+        problem = Problem(filename, text=text)
+
+        with self.lock:
+            self.misses += 1
+            self.problems[key] = problem
+            while len(self.problems) > self.size:
+                self.problems.popitem(last=False)
+
+        return problem
+
+
+class Service(object):
+    """ Solver service.
+
+    Requests are JSON objects, one per line:
+
+        {"id": 1, "dimacs": "p cnf 2 1\\n1 -2 0", "algorithm": "walksat",
+         "params": {"p": 0.5, "max_flips": 1000}, "timeout": 10}
+
+    where "path" may be given instead of "dimacs". Each request is solved
+    in a forked process, so it can be killed when it runs out of time.
+    Responses carry the same status codes as the output files, along
+    with the run statistics (such as the model count or MaxSAT cost):
+
+        {"id": 1, "status": 1, "model": [true, false], "stats": {}}
+
+    Attributes:
+        cache(ProblemCache): Parsed problems.
+        pool(ThreadPoolExecutor): Workers waiting for the solvers.
+        timeout(float): Default time limit per request (seconds).
+    """
+
+    def __init__(self, workers, cache_size, timeout=None):
+        self.cache = ProblemCache(cache_size)
+        self.pool = ThreadPoolExecutor(max_workers=workers)
+        self.timeout = timeout
+        self.context = multiprocessing.get_context("fork")
+
+    def submit(self, line, reply):
+        """ Queue a request.
+
+        Args:
+            line(str): JSON encoded request.
+            reply(function): Called with the response once it is ready.
+
+        Returns:
+            future(Future): The pending response.
+        """
+
+        future = self.pool.submit(self.handle, line)
+        future.add_done_callback(lambda f: reply(f.result()))
+        return future
+
+    def handle(self, line):
+        """ Serve a request.
+
+        Args:
+            line(str): JSON encoded request.
+
+        Returns:
+            response(dict): The response to the request.
+        """
+
+        response = {"id": None}
+
+        try:
+            request = json.loads(line)
+            response["id"] = request.get("id")
+
+            if "dimacs" in request:
+                problem = self.cache.get(request["dimacs"])
+            else:
+                with open(request["path"], 'r') as f:
+                    problem = self.cache.get(f.read(), request["path"])
+
+            algorithm = ALGORITHMS[request["algorithm"]]
+            if problem.format not in algorithm["formats"]:
+                raise ProblemTypeError(problem.format)
+            args = algorithmArgs(algorithm, request.get("params", {}))
+            result, stats, timed_out = self.solve(
+                problem,
+                algorithm["function"],
+                args,
+                request.get("timeout", self.timeout)
+            )
+        # every request gets exactly one reply, whatever went wrong
+        except Exception as e:
+            logging.info("Bad request: {}".format(e))
+            response["status"] = Problem.STATUS[None]
+            response["error"] = "{}: {}".format(type(e).__name__, e)
+            return response
+
+        response["status"] = Problem.status(result, stats)
+        response["model"] = result if result else None
+        response["stats"] = stats
+        if timed_out:
+            response["timeout"] = True
+        return response
+
+    def solve(self, problem, func, args, timeout=None):
+        """ Run an algorithm in a child process.
+
+        Args:
+            problem(Problem): The problem to solve.
+            func(function): The algorithm.
+            args(Namespace): Arguments of the algorithm.
+            timeout(float): Time limit (seconds), None for no limit.
+
+        Returns:
+            A tuple with the algorithm result, the run statistics and
+            whether it timed out.
+        """
+
+        receiver, sender = self.context.Pipe(duplex=False)
+        process = self.context.Process(
+            target=_solve,
+            args=(sender, problem, func, args),
+            daemon=True
+        )
+        process.start()
+        sender.close()
+
+        try:
+            if not receiver.poll(timeout):
+                logging.info("Request timed out after {}s".format(timeout))
+                return (None, {}, True)
+            kind, value = receiver.recv()
+        except EOFError:
+            raise ValueError("solver process died")
+        finally:
+            receiver.close()
+            process.terminate()
+            process.join()
+
+        if kind == "error":
+            raise ValueError(value)
+        result, stats = value
+        return (result, stats, False)
+
+
+def _solve(sender, problem, func, args):
+    """ Child process entry point: run the algorithm and send the result.
+
+    Args:
+        sender(Connection): Where the result is sent to.
+        problem(Problem): The problem to solve.
+        func(function): The algorithm.
+        args(Namespace): Arguments of the algorithm.
+    """
+
+    try:
+        result = func(problem, args)
+        sender.send(("result", (result, problem.stats)))
+    except Exception as e:
+        sender.send(("error", "{}: {}".format(type(e).__name__, e)))
+    sender.close()
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """ Serves the requests of one socket connection. """
+
+    def handle(self):
+        # futures are marked done before their callbacks run, so the
+        # replies themselves are counted
+        written = threading.Condition()
+        replies = [0]
+
+        def reply(response):
+            with written:
+                try:
+                    self.wfile.write((json.dumps(response) + "\n").encode())
+                    self.wfile.flush()
+                finally:
+                    replies[0] += 1
+                    written.notify_all()
+
+        requests = 0
+        for line in self.rfile:
+            if line.strip():
+                requests += 1
+                self.server.service.submit(line.decode(), reply)
+
+        # Keep the connection open until every response is written
+        with written:
+            written.wait_for(lambda: replies[0] == requests)
+
+
+class SocketServer(socketserver.ThreadingUnixStreamServer):
+    """ Unix socket server sharing one solver service. """
+
+    daemon_threads = True
+
+    def __init__(self, path, service):
+        self.service = service
+        super().__init__(path, RequestHandler)
+
+
+def serveStdio(service):
+    """ Serve JSON lines requests from stdin, replying to stdout.
+
+    Args:
+        service(Service): The solver service.
+    """
+
+    lock = threading.Lock()
+
+    def reply(response):
+        with lock:
+            sys.stdout.write(json.dumps(response) + "\n")
+            sys.stdout.flush()
+
+    for line in sys.stdin:
+        if line.strip():
+            service.submit(line, reply)
+
+    service.pool.shutdown(wait=True)
+
+
+def main():
+    """ Main function of the solver service.
+
+    Parses arguments and serves requests until interrupted.
+    """
+
+    parser = ArgParser(description="", epilog="",
+                       formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument("-s", "--socket",
+                        help="unix socket to listen on (instead of \
+                            stdin/stdout)")
+    parser.add_argument("-w", "--workers",
+                        help="number of requests solved concurrently",
+                        type=int,
+                        default=os.cpu_count())
+    parser.add_argument("-c", "--cache-size",
+                        help="number of parsed problems to keep",
+                        type=int,
+                        default=32)
+    parser.add_argument("-t", "--timeout",
+                        help="default time limit per request (seconds)",
+                        type=float)
+    parser.add_argument("-l", "--logfile",
+                        help="file where the log is to be written to (instead \
+                            of the console)")
+    parser.add_argument("-v", "--verbosity",
+                        help="verbosity", action="count",
+                        default=0)
+
+    args = parser.parse_args()
+
+    logging.basicConfig(format='%(asctime)s %(message)s',
+                        datefmt='%Y/%m/%d %H:%M:%S',
+                        filename=args.logfile,
+                        level=10*(
+                            (4-args.verbosity) if args.verbosity < 4 else 1
+                        ))
+
+    service = Service(args.workers, args.cache_size, args.timeout)
+
+    if args.socket is None:
+        logging.debug("Serving stdin")
+        serveStdio(service)
+        return
+
+    if os.path.exists(args.socket):
+        os.unlink(args.socket)
+
+    logging.debug("Listening on {}".format(args.socket))
+    with SocketServer(args.socket, service) as server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(args.socket)
+
+if __name__ == '__main__':
+    main()
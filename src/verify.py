@@ -0,0 +1,154 @@
+"""
+"""
+
+
+def trueLiterals(model):
+    """ Literals made true by a model.
+
+    Literals are kept as DIMACS tokens so clauses read from a file can be
+    checked without converting them to integers.
+
+    Args:
+        model(list): Truth values of the symbols (None if unassigned).
+
+    Returns:
+        Set of literals (str).
+    """
+
+    literals = set()
+    for i in range(len(model)):
+        if model[i] is True:
+            literals.add(str(i+1))
+        elif model[i] is False:
+            literals.add('-' + str(i+1))
+    return literals
+
+
+def readClauses(filename):
+    """ Stream the clauses of a DIMACS file.
+
+    Only the hard clauses of weighted problems are returned, the soft
+    ones may be falsified by a model.
+
+    Args:
+        filename(str): DIMACS input file.
+
+    Yields:
+        Clauses as lists of literals (str).
+    """
+
+    cur_clause = []
+    # weighted clauses start with their weight
+    weighted = False
+    top = None
+    weight = None
+
+    with open(filename, 'r') as f:
+        for line in f:
+            params = line.split()
+
+            if not params:
+                continue
+
+            if params[0] == 'p':
+                weighted = params[1] == "wcnf"
+                if len(params) > 4:
+                    top = int(params[4])
+                continue
+
+            # Skip comments
+            if not (
+                params[0].isdigit() or
+                (params[0].startswith("-") and params[0][1:].isdigit())
+            ):
+                continue
+
+            # Most files have exactly one clause per line
+            if (
+                not weighted and not cur_clause and
+                params[-1] == "0" and "0" not in params[:-1]
+            ):
+                if len(params) > 1:
+                    yield params[:-1]
+                continue
+
+            for var in params:
+                if weighted and weight is None:
+                    weight = int(var)
+                elif var == "0":
+                    if cur_clause and (
+                        not weighted or (top is not None and weight >= top)
+                    ):
+                        yield cur_clause
+                    cur_clause = []
+                    weight = None
+                else:
+                    cur_clause.append(var)
+
+    if cur_clause and (
+        not weighted or (top is not None and weight >= top)
+    ):
+        yield cur_clause
+
+
+def problemClauses(problem):
+    """ Hard clauses of a parsed problem.
+
+    Args:
+        problem(Problem): The problem.
+
+    Yields:
+        Clauses as lists of literals (str).
+    """
+
+    for clause in problem.expression:
+        if problem.isHard(clause):
+            yield [str(int(literal)) for literal in clause]
+
+
+def check(clauses, model):
+    """ Check if a model satisfies every clause.
+
+    Args:
+        clauses(iterable): Clauses as lists of literals (str).
+        model(list): Truth values of the symbols.
+
+    Returns:
+        Index of the first falsified clause or None if all are satisfied.
+    """
+
+    literals = trueLiterals(model)
+
+    for i, clause in enumerate(clauses):
+        if literals.isdisjoint(clause):
+            return i
+
+    return None
+
+
+def verifyFile(filename, model):
+    """ Check a model against a DIMACS file without loading it.
+
+    Args:
+        filename(str): DIMACS input file.
+        model(list): Truth values of the symbols.
+
+    Returns:
+        Index of the first falsified clause or None if all are satisfied.
+    """
+
+    return check(readClauses(filename), model)
+
+
+def verifyProblem(problem, model):
+    """ Check a model against a parsed problem.
+
+    Args:
+        problem(Problem): The problem.
+        model(list): Truth values of the symbols.
+
+    Returns:
+        Index of the first falsified clause or None if all are satisfied.
+    """
+
+    return check(problemClauses(problem), model)
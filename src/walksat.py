@@ -18,24 +18,58 @@ def walksat(problem, args):
         None: If no solution was found. 
     """
 
-    p = args.p
-    max_flips = args.max_flips
+    A, falsified = search(problem, args.p, args.max_flips)
+
+    # No solution was found (this doesn't mean it doesn't exist!)
+    if falsified:
+        return None
+
+    return A
+
+
+def search(problem, p, max_flips):
+    """ Walksat search keeping track of the best assignment.
+
+    Args:
+        problem(Problem): The problem to solve.
+        p(float): Probability of picking a symbol at random
+        max_flips(int): Maximum number of flips
+
+    Returns:
+        A tuple with the assignment that satisfies the most clauses and
+        the number of clauses it falsifies.
+    """
 
     # Random truth assignment to all the symbols in the problem
     A = [bool(random.getrandbits(1)) for x in range(problem.variables)]
     problem.set(A)
 
+    score = problem.expression.score()
+    best_score = score
+    best = problem.get()
+
+    problem.stats["flips"] = 0
+    problem.stats["best score"] = best_score
+
     # Try to solve the problem up to a maximum number of flips
     for i in range(max_flips):
         # Stop if problem is solved
-        if problem.expression:
-            return problem.get()
+        if score == len(problem.expression):
+            break
 
         # Flip a symbol
         flip_symbol(problem, p)
 
-    # No solution was found (this doesn't mean it doesn't exist!)
-    return None
+        score = problem.expression.score()
+        if score > best_score:
+            best_score = score
+            best = problem.get()
+
+        problem.stats["flips"] = i + 1
+        problem.stats["best score"] = best_score
+        problem.report()
+
+    return (best, len(problem.expression) - best_score)
 
 
 def flip_symbol(problem, p):